@@ -1,6 +1,7 @@
-from itertools import cycle
+from functools import lru_cache
 from typing import NamedTuple
 import os
+import sys
 
 ################### Player ##################
 # Represents a player in the game.
@@ -15,31 +16,98 @@ class Player(NamedTuple):
     label: str
     name: str
 
-################### Move ###################
-# Represents a move in the game.
-#
-# Parameters:
-# row: int - The row index of the move.
-# col: int - The column index of the move.
-# label: str - The label representing the player (e.g., "X" or "O") making the move
-#
-# Returns: NamedTuple - A named tuple representing a move.
-############################################
-class Move(NamedTuple):
-    row: int
-    col: int
-    label: str = ""
+# Cell values: an empty cell, or the mark of the first (X) or second (O) player.
+EMPTY, X, O = 0, 1, 2
 
 BOARD_SIZE = 4
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+# Terminals that understand ANSI escapes are cleared with a write instead of a subprocess.
+USE_ANSI_CLEAR = sys.stdout.isatty() and os.environ.get("TERM") != "dumb"
 DEFAULT_PLAYERS = (
     Player(label="X", name="SimpliSafe"),
     Player(label="O", name="Parth"),
 )
 
+############# _getWinningMasks #############
+# Builds the bitmask of every winning combination: rows, columns,
+# both diagonals, every 2x2 block and the four corners.
+# Bit (row * boardSize + col) is set for each cell in the combination.
+#
+# Parameters:
+# boardSize: int - The size of the board.
+#
+# Returns: tuple - A tuple of int bitmasks, cached per board size.
+############################################
+@lru_cache(maxsize=None)
+def _getWinningMasks(boardSize):
+    rowMask = (1 << boardSize) - 1
+    rows = [rowMask << (row * boardSize) for row in range(boardSize)]
+
+    colMask = sum(1 << (row * boardSize) for row in range(boardSize))
+    columns = [colMask << col for col in range(boardSize)]
+
+    firstDiagonal = sum(1 << (row * (boardSize + 1)) for row in range(boardSize))
+
+    secondDiagonal = sum(1 << ((row + 1) * (boardSize - 1)) for row in range(boardSize))
+
+    blockMask = 0b11 | (0b11 << boardSize)
+    twoByTwos = [
+        blockMask << (row * boardSize + col)
+        for row in range(boardSize - 1)
+        for col in range(boardSize - 1)
+    ]
+
+    corners = (
+        1 | (1 << (boardSize - 1))
+        | (1 << ((boardSize - 1) * boardSize)) | (1 << (boardSize * boardSize - 1))
+    )
+
+    return tuple(rows + columns + [firstDiagonal, secondDiagonal] + twoByTwos + [corners])
+
+############ _getMasksByCell ###############
+# Groups the winning masks by the cells they cover, so that only the
+# combinations through the last move need to be checked.
+#
+# Parameters:
+# boardSize: int - The size of the board.
+#
+# Returns: tuple - For each cell index, a tuple of the masks containing it.
+############################################
+@lru_cache(maxsize=None)
+def _getMasksByCell(boardSize):
+    masks = _getWinningMasks(boardSize)
+    return tuple(
+        tuple(mask for mask in masks if mask >> cell & 1)
+        for cell in range(boardSize * boardSize)
+    )
+
+############ _getWinningCombos ############
+# Maps each winning mask back to the cells it covers.
+#
+# Parameters:
+# boardSize: int - The size of the board.
+#
+# Returns: dict - A dict of mask -> tuple of (row, col) cells.
+############################################
+@lru_cache(maxsize=None)
+def _getWinningCombos(boardSize):
+    return {
+        mask: tuple(
+            divmod(cell, boardSize)
+            for cell in range(boardSize * boardSize)
+            if mask >> cell & 1
+        )
+        for mask in _getWinningMasks(boardSize)
+    }
+
 ############### TicTacToeGame ##############
 # Manages the state of the Tic-Tac-Toe game.
 ############################################
 class TicTacToeGame:
+    # Winning tables for the default board, shared by every game of that size.
+    _masksByCell = _getMasksByCell(BOARD_SIZE)
+    _winningCombos = _getWinningCombos(BOARD_SIZE)
+
     ################### __init__ ###################
     # Initializes the game with players and board size.
     #
@@ -48,83 +116,121 @@ class TicTacToeGame:
     # boardSize: int - The size of the board 
     #
     # Returns: None
+    #
+    # Raises: ValueError - If there aren't exactly two players with different labels.
     ############################################
     def __init__(self, players=DEFAULT_PLAYERS, boardSize=BOARD_SIZE):
-        self._players = cycle(players)
+        if len(players) != 2 or players[0].label == players[1].label:
+            raise ValueError("The game needs exactly two players with different labels.")
+        self._players = players
+        self._cellLabels = {EMPTY: " ", X: players[0].label, O: players[1].label}
         self.boardSize = boardSize
-        self.currentPlayer = next(self._players)
-        self._currentMoves = [
-            [Move(row, col) for col in range(self.boardSize)]
-            for row in range(self.boardSize)
-        ]
-        self._winningCombos = self._getWinningCombos()
-        self._hasWinner = False
-        self.winnerCombo = []
+        self._cellCount = self.boardSize * self.boardSize
+        if self.boardSize != BOARD_SIZE:
+            self._masksByCell = _getMasksByCell(self.boardSize)
+            self._winningCombos = _getWinningCombos(self.boardSize)
+        self._header = "   " + "   ".join(map(str, range(self.boardSize)))
+        self._separator = "  " + "----" * self.boardSize + "-"
+        self.resetGame()
 
-    ########## _getWinningCombos ##############
-    # Defines all possible winning combinations.
+    ################# resetGame ##################
+    # Clears the board so the same game can be played again.
+    # The winning tables and board text are kept.
     #
     # Parameters: None
     #
-    # Returns: list - A list of winning combinations.
-    ############################################
-    def _getWinningCombos(self):
-        rows = [
-            [(move.row, move.col) for move in row]
-            for row in self._currentMoves
-        ]
-        
-        columns = [
-            [(move.row, move.col) for move in col]
-            for col in zip(*self._currentMoves)
-        ]
-        
-        firstDiagonal = [(row, row) for row in range(self.boardSize)]
-        
-        secondDiagonal = [(row, self.boardSize - 1 - row) for row in range(self.boardSize)]
-        
-        twoByTwos = []
-        for row in range(self.boardSize - 1):
-            for col in range(self.boardSize - 1):
-                twoByTwos.append([
-                    (row, col), (row, col+1),
-                    (row+1, col), (row+1, col+1)
-                ])
-        
-        corners = [
-            (0, 0), (0, self.boardSize - 1),
-            (self.boardSize - 1, 0), (self.boardSize - 1, self.boardSize - 1)
-        ]
-
-        winningCombos = rows + columns + [firstDiagonal, secondDiagonal] + twoByTwos + [corners]
-        
-        return winningCombos
+    # Returns: None
+    ##############################################
+    def resetGame(self):
+        self._playerIndex = 0
+        self.currentPlayer = self._players[0]
+        self._boards = [0, 0]  # One bitboard per player, indexed like self._players
+        self._moveCount = 0
+        self._lastCell = None
+        self._hasWinner = False
+        self.winnerCombo = []
+        self._updatePrompts()
 
     ################ checkWinner #################
-    # Checks if there's a winner.
+    # Checks if the last move made a winner. Only the combinations through
+    # the last move are checked, and none before the first player could
+    # have filled the shortest combination (a line or a 4-cell block).
     #
     # Parameters: None
     #
     # Returns: bool - True if there's a winner, False otherwise.
     #############################################
     def checkWinner(self):
-        for combo in self._winningCombos:
-            results = set(self._currentMoves[n][m].label for n, m in combo)
-            if len(results) == 1 and "" not in results:
+        if self._moveCount < 2 * min(self.boardSize, 4) - 1:
+            return False
+        # Only the player who made the last move can have completed a combination.
+        board = self._boards[0] if self._boards[0] >> self._lastCell & 1 else self._boards[1]
+        for mask in self._masksByCell[self._lastCell]:
+            if (board & mask) == mask:
                 self._hasWinner = True
-                self.winnerCombo = combo
+                self.winnerCombo = list(self._winningCombos[mask])
                 return True
         return False
 
-    ############### anyMovesLeft #################
-    # Checks if there are any moves left.
+    ############### togglePlayer ################
+    # Passes the turn to the next player.
     #
     # Parameters: None
     #
-    # Returns: bool - True if there are moves left, False otherwise.
+    # Returns: None
     ##############################################
-    def anyMovesLeft(self):
-        return any(move.label == "" for row in self._currentMoves for move in row)
+    def togglePlayer(self):
+        self._playerIndex ^= 1
+        self.currentPlayer = self._players[self._playerIndex]
+        self._updatePrompts()
+
+    ############## _updatePrompts ################
+    # Builds the row and column prompts for the current player.
+    #
+    # Parameters: None
+    #
+    # Returns: None
+    ##############################################
+    def _updatePrompts(self):
+        player = f"Player {self.currentPlayer.name} - {self.currentPlayer.label}"
+        self._rowPrompt = f"{player}, enter row (0-{self.boardSize-1}) or 'q' to quit: "
+        self._colPrompt = f"{player}, enter column (0-{self.boardSize-1}) or 'q' to quit: "
+
+    ################# getCell ####################
+    # Gets the mark placed on a cell.
+    #
+    # Parameters:
+    # row: int - The row index of the cell.
+    # col: int - The column index of the cell.
+    #
+    # Returns: int - X for the first player, O for the second, or EMPTY.
+    ##############################################
+    def getCell(self, row, col):
+        bit = 1 << (row * self.boardSize + col)
+        if self._boards[0] & bit:
+            return X
+        if self._boards[1] & bit:
+            return O
+        return EMPTY
+
+    ################# makeMove ###################
+    # Places the current player's label on the board.
+    #
+    # Parameters:
+    # row: int - The row index of the move.
+    # col: int - The column index of the move.
+    #
+    # Returns: bool - True if the move was placed, False if the cell is taken.
+    ##############################################
+    def makeMove(self, row, col):
+        cell = row * self.boardSize + col
+        bit = 1 << cell
+        if (self._boards[0] | self._boards[1]) & bit:
+            return False
+        self._moveCount += 1
+        self._lastCell = cell
+        self._boards[self._playerIndex] |= bit
+        return True
 
     ################ isGameOver ##################
     # Checks if the game is over.
@@ -134,7 +240,7 @@ class TicTacToeGame:
     # Returns: bool - True if the game is over, False otherwise.
     ##############################################
     def isGameOver(self):
-        return self._hasWinner or not self.anyMovesLeft()
+        return self._hasWinner or self._moveCount == self._cellCount
 
 ############### printBoard ##################
 # Prints the current state of the game board to the console.
@@ -145,38 +251,46 @@ class TicTacToeGame:
 # Returns: None
 ############################################
 def printBoard(game):
-    os.system('cls' if os.name == 'nt' else 'clear')  # Clear console screen
-    print("Press 'q' to quit at any time.")
-    print("Welcome to 4x4 Tic-Tac-Toe!")
-    print(f"Player {game.currentPlayer.label}'s turn")
-    print("   " + "   ".join(str(i) for i in range(game.boardSize)))
-    print("  " + "----" * game.boardSize + "-")
-    for i, row in enumerate(game._currentMoves):
-        rowStr = f"{i} | " + " | ".join(move.label if move.label else " " for move in row) + " |"
-        print(rowStr)
-        print("  " + "----" * game.boardSize + "-")
-    print()
+    if not USE_ANSI_CLEAR:
+        os.system('cls' if os.name == 'nt' else 'clear')  # Clear console screen
+    lines = [
+        "Press 'q' to quit at any time.",
+        "Welcome to 4x4 Tic-Tac-Toe!",
+        f"Player {game.currentPlayer.label}'s turn",
+        game._header,
+        game._separator,
+    ]
+    for row in range(game.boardSize):
+        lines.append(f"{row} | " + " | ".join(game._cellLabels[game.getCell(row, col)] for col in range(game.boardSize)) + " |")
+        lines.append(game._separator)
+    sys.stdout.write((CLEAR_SCREEN if USE_ANSI_CLEAR else "") + "\n".join(lines) + "\n\n")
 
 ############### getUserInput #################
 # Get the input from user and validates it
 #
 # Parameters: 
 # prompt: str
-# validValues: list
+# validValues: range
 #
 # Returns: 
 # user_input: int if a valid input is provided otherwise it will quit
 #############################################
 def getUserInput(prompt, validValues):
     while True:
-        userInput = input(prompt).strip()  # Strip whitespace from input
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:  # End of input, nothing more to read
+            raise SystemExit(0)
+        userInput = line.strip()  # Strip whitespace from input
         if userInput.lower() == 'q':
             print("Quitting the game...")
-            exit()
-        elif userInput.isdigit() and int(userInput) in validValues:
-            return int(userInput)
-        else:
-            print("Invalid input! Please enter a number from the valid range.")
+            raise SystemExit(0)
+        if userInput.isdecimal():  # Digits only, so no signs or underscores
+            value = int(userInput)
+            if value in validValues:
+                return value
+        print("Invalid input! Please enter a number from the valid range.")
 
 ################### main ###################
 # Create the game and run it.
@@ -186,30 +300,25 @@ def getUserInput(prompt, validValues):
 # Returns: None
 ############################################
 def main():
+    if USE_ANSI_CLEAR and os.name == 'nt':
+        os.system('')  # Enable ANSI escape handling in the Windows console
     game = TicTacToeGame()
     printBoard(game)
+    validValues = range(game.boardSize)
 
     while not game.isGameOver():
-        row = getUserInput(
-            f"Player {game.currentPlayer.name} - {game.currentPlayer.label}, enter row (0-{game.boardSize-1}) or 'q' to quit: ",
-            list(range(game.boardSize))
-        )
-        col = getUserInput(
-            f"Player {game.currentPlayer.name} - {game.currentPlayer.label}, enter column (0-{game.boardSize-1}) or 'q' to quit: ",
-            list(range(game.boardSize))
-        )
+        row = getUserInput(game._rowPrompt, validValues)
+        col = getUserInput(game._colPrompt, validValues)
         
-        move = Move(row, col, game.currentPlayer.label)
-        if game._currentMoves[row][col].label == "":
-            game._currentMoves[row][col] = move
+        if game.makeMove(row, col):
             printBoard(game)
             if game.checkWinner():
                 print(f"Player {game.currentPlayer.name} - {game.currentPlayer.label} wins!")
                 break
-            elif not game.anyMovesLeft():
+            elif game.isGameOver():
                 print("It's a tie!")
                 break
-            game.currentPlayer = next(game._players)
+            game.togglePlayer()
         else:
             print("Invalid move! Try again.")
 